@@ -1,10 +1,25 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import pypdf
 import re
 import plotly.express as px
 from io import BytesIO
 
+# PyMuPDF é bem mais rápido que o pypdf na extração de texto; se não estiver
+# instalado, caímos de volta no pypdf.
+try:
+    import pymupdf
+except ImportError:
+    pymupdf = None
+
+# Numba (opcional) compila a conversão numérica das colunas; sem ele usamos
+# as operações vetorizadas do pandas.
+try:
+    import numba
+except ImportError:
+    numba = None
+
 # --- CONFIGURAÇÃO DA PÁGINA ---
 st.set_page_config(
     page_title="CineData BR - Analítica ANCINE",
@@ -14,95 +29,250 @@ st.set_page_config(
 
 # --- FUNÇÕES DE LIMPEZA E EXTRAÇÃO (ENGINE) ---
 
-def clean_currency_br(x):
-    """Converte string '1.000,00' para float 1000.00"""
-    if not isinstance(x, str):
-        return 0.0
-    clean = x.replace('R$', '').strip()
-    clean = clean.replace('.', '') # Remove milhar
-    clean = clean.replace(',', '.') # Troca decimal
-    try:
-        return float(clean)
-    except ValueError:
-        return 0.0
-
-def clean_int_br(x):
-    """Converte string '1.000' para int 1000"""
-    if not isinstance(x, str):
-        return 0
-    clean = x.replace('.', '').strip()
-    try:
-        return int(clean)
-    except ValueError:
-        return 0
+PDF_BACKEND = "pymupdf" if pymupdf is not None else "pypdf"
+
+# Linha de filme: Ano, Título, CPB e Metadados numa única passada.
+# O CPB (ex: B0901024500000 ou E1402431200000) é o divisor mais seguro
+# entre o Título e os metadados. Os espaços nas bordas ficam fora dos grupos,
+# então a linha não precisa de strip(); usar com .match. A cauda gulosa (.*\S)
+# só recua sobre os espaços finais (um (.+?)\s*$ testaria o fim a cada caractere).
+LINE_RE = re.compile(r'\s*(\d{4})\s+(.+?)\s+([BE]\d{13})\s+(.*\S)')
+
+# Qualquer CPB na página; páginas sem nenhum (capas, índices) são puladas
+CPB_RE = re.compile(r'[BE]\d{13}')
+
+def parse_currency_br(s):
+    """Converte uma Series de strings '1.000,00' para float 1000.00 (inválidos viram 0)."""
+    clean = (
+        s.str.replace('R$', '', regex=False)
+         .str.replace('.', '', regex=False) # Remove milhar
+         .str.replace(',', '.', regex=False) # Troca decimal
+         .str.strip()
+    )
+    return pd.to_numeric(clean, errors='coerce').fillna(0.0).astype('float64')
+
+def parse_int_br(s):
+    """Converte uma Series de strings '1.000' para int 1000 (inválidos viram 0)."""
+    clean = s.str.replace('.', '', regex=False).str.strip()
+    return pd.to_numeric(clean, errors='coerce').fillna(0).astype('int64')
+
+if numba is not None:
+    # Sem parallel=True: cada sessão do Streamlit roda na sua thread e o
+    # threading layer 'workqueue' (fallback sem TBB/OpenMP) aborta o processo
+    # quando dois kernels paralelos rodam ao mesmo tempo. cache=True evita
+    # recompilar a cada processo do servidor.
+    @numba.njit(cache=True)
+    def _parse_br_kernel(buf, offsets, decimal):
+        """Converte os tokens buf[offsets[i]:offsets[i+1]] ('1.000,00') em float.
+
+        Segue as regras de parse_currency_br (decimal=True) e parse_int_br:
+        '.' é ignorado, 'R$' só é removido em moeda, espaços só nas bordas,
+        sinal '+'/'-' no início e inválidos viram 0. Diferenças em relação ao
+        caminho pandas:
+        - notação científica ('1e5'), 'inf' e 'nan' viram 0;
+        - tokens com mais de 18 dígitos (que estourariam o int64) viram 0;
+        - espaços não ASCII (ex: NBSP) nas bordas invalidam o token;
+        - com mais de 15 dígitos significativos o último bit do float pode
+          diferir (a mantissa é convertida e depois dividida por 10**n).
+        """
+        n = len(offsets) - 1
+        out = np.zeros(n, dtype=np.float64)
+        for i in range(n):
+            j = offsets[i]
+            end = offsets[i + 1]
+            mantissa = 0
+            n_digits = 0
+            n_decimals = -1 # -1 enquanto não houver vírgula
+            negative = False
+            seen_content = False # dígito, sinal ou vírgula
+            seen_digit = False
+            trailing = False # espaço depois do conteúdo: só cabe mais espaço
+            valid = True
+            while j < end:
+                c = buf[j]
+                if c == 46: # '.' (milhar) é removido
+                    j += 1
+                    continue
+                if decimal and c == 82 and j + 1 < end and buf[j + 1] == 36: # 'R$'
+                    j += 2
+                    continue
+                if c == 32 or 9 <= c <= 13: # espaço
+                    if seen_content:
+                        trailing = True
+                    j += 1
+                    continue
+                if trailing:
+                    valid = False
+                    break
+                if 48 <= c <= 57: # dígito
+                    n_digits += 1
+                    if n_digits > 18:
+                        valid = False
+                        break
+                    mantissa = mantissa * 10 + (c - 48)
+                    if n_decimals >= 0:
+                        n_decimals += 1
+                    seen_digit = True
+                elif c == 44 and decimal and n_decimals < 0: # vírgula decimal
+                    n_decimals = 0
+                elif (c == 45 or c == 43) and not seen_content: # sinal
+                    negative = c == 45
+                else:
+                    valid = False
+                    break
+                seen_content = True
+                j += 1
+            if valid and seen_digit:
+                value = mantissa / 10.0 ** max(n_decimals, 0)
+                out[i] = -value if negative else value
+        return out
+
+def _to_numeric_br(values, decimal):
+    """Converte uma lista de tokens numéricos BR em array (float se decimal, senão int)."""
+    if numba is None:
+        s = pd.Series(values, dtype=object)
+        return (parse_currency_br(s) if decimal else parse_int_br(s)).to_numpy()
+    
+    # Tokens concatenados num único buffer de bytes + offsets de cada um
+    encoded = [v.encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+    buf = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    out = _parse_br_kernel(buf, offsets, decimal)
+    return out if decimal else out.astype(np.int64)
+
+def _extract_pages(uploaded_file, backend=PDF_BACKEND):
+    """Gera o texto de cada página do PDF usando o backend escolhido."""
+    # As páginas são lidas em série nos dois backends: o MuPDF não suporta
+    # threads e o extract_text do pypdf é Python puro, preso ao GIL
+    if backend == "pymupdf":
+        with pymupdf.open(stream=uploaded_file.getvalue(), filetype="pdf") as doc:
+            for page in doc:
+                # sort=True remonta as linhas da tabela; sem ele o MuPDF põe
+                # cada célula numa linha própria e o LINE_RE nunca casa
+                yield page.get_text("text", sort=True)
+    else:
+        reader = pypdf.PdfReader(uploaded_file)
+        for page in reader.pages:
+            yield page.extract_text()
+
+def _parse_one(uploaded_file):
+    """Extrai as colunas (ano, título, nacionalidade, público, renda) de um PDF."""
+    # Uma lista por coluna (e não um dict por linha): o DataFrame é montado
+    # direto dos arrays, sem reinferir tipos linha a linha.
+    anos, titulos, nacs, publicos, rendas = [], [], [], [], []
+    
+    # Métodos ligados localmente para evitar lookup de atributo por linha
+    line_match = LINE_RE.match
+    cpb_search = CPB_RE.search
+
+    for text in _extract_pages(uploaded_file):
+        # Uma única varredura da página antes de quebrá-la em linhas
+        if not text or not cpb_search(text): continue
+        
+        lines = text.split('\n')
+        for line in lines:
+            # Ano Título [CPB] Metadados; linhas fora do padrão são descartadas
+            m = line_match(line)
+            if not m:
+                continue
+            ano, titulo, _cpb, meta_part = m.groups()
+            
+            # Extrair Público e Renda da última parte (últimos 2 tokens)
+            # rsplit para no 2º corte: não tokeniza o restante dos metadados
+            tokens = meta_part.rsplit(None, 2)
+            if len(tokens) >= 2:
+                publico_raw, renda_raw = tokens[-2:]
+                
+                # Identificar Nacionalidade (heuristicamente)
+                nacionalidade = "Brasileira" if "Brasileira" in meta_part else "Estrangeira"
+                
+                anos.append(int(ano))
+                titulos.append(titulo)
+                nacs.append(nacionalidade)
+                publicos.append(publico_raw)
+                rendas.append(renda_raw)
+
+    return anos, titulos, nacs, publicos, rendas
 
 @st.cache_data(show_spinner=False)
 def parse_ancine_pdf(uploaded_files):
     """Lê múltiplos PDFs da ANCINE e extrai dados tabulares via Regex."""
-    data = []
+    anos, titulos, nacs, publicos, rendas = [], [], [], [], []
     
-    # Regex para identificar CPB (ex: B0901024500000 ou E1402431200000)
-    # O CPB é o divisor mais seguro entre o Título e os metadados
-    cpb_pattern = re.compile(r'([BE]\d{13})')
-    
-    # Regex para garantir que a linha começa com um Ano (4 dígitos)
-    year_check = re.compile(r'^(\d{4})\s+')
-
     for uploaded_file in uploaded_files:
         try:
-            reader = pypdf.PdfReader(uploaded_file)
-            
-            for page in reader.pages:
-                text = page.extract_text()
-                if not text: continue
-                
-                lines = text.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    
-                    # Filtro 1: A linha deve começar com um ano
-                    if not year_check.match(line):
-                        continue
-                    
-                    # Divisão: Título [CPB] Metadados
-                    parts = cpb_pattern.split(line)
-                    
-                    if len(parts) >= 3:
-                        # parts[0] -> "2009 Título do Filme "
-                        # parts[1] -> "B090000..." (O CPB)
-                        # parts[2] -> " Ficção ... 10.000 50.000,00"
-                        
-                        header_part = parts[0].strip()
-                        meta_part = parts[-1].strip()
-                        
-                        # Extrair Ano e Título da primeira parte
-                        try:
-                            ano = header_part[:4]
-                            titulo = header_part[4:].strip()
-                        except:
-                            continue # Falha na estrutura
-                        
-                        # Extrair Público e Renda da última parte (últimos 2 tokens)
-                        tokens = meta_part.split()
-                        if len(tokens) >= 2:
-                            renda_raw = tokens[-1]
-                            publico_raw = tokens[-2]
-                            
-                            # Identificar Nacionalidade (heuristicamente)
-                            nacionalidade = "Brasileira" if "Brasileira" in meta_part else "Estrangeira"
-                            
-                            data.append({
-                                'Ano_Exibicao': int(ano),
-                                'Titulo': titulo,
-                                'Nacionalidade': nacionalidade,
-                                'Publico': clean_int_br(publico_raw),
-                                'Renda': clean_currency_br(renda_raw)
-                            })
-                            
+            f_anos, f_titulos, f_nacs, f_publicos, f_rendas = _parse_one(uploaded_file)
         except Exception as e:
             st.error(f"Erro ao ler arquivo {uploaded_file.name}: {e}")
+            continue
+        anos.extend(f_anos)
+        titulos.extend(f_titulos)
+        nacs.extend(f_nacs)
+        publicos.extend(f_publicos)
+        rendas.extend(f_rendas)
+
+    # Tipos mais estreitos onde não há perda: o Público vai para o menor
+    # inteiro que comporta os valores (int8/int16/int32); as somas do groupby
+    # mantêm esse tipo e só sobem para int64 quando estouram. A Renda fica em
+    # float64, pois o float32 não guarda os centavos de valores na casa dos
+    # milhões.
+    return pd.DataFrame({
+        'Ano_Exibicao': np.asarray(anos, dtype=np.int16),
+        'Titulo': pd.array(titulos, dtype='string[pyarrow]'), # str.* via kernels do Arrow
+        'Nacionalidade': pd.Categorical(nacs),
+        'Publico': pd.to_numeric(_to_numeric_br(publicos, decimal=False), downcast='integer'),
+        'Renda': _to_numeric_br(rendas, decimal=True),
+    })
+
+@st.cache_data(show_spinner=False)
+def build_grouped(df_raw):
+    """Soma as bilheterias de anos diferentes para o mesmo filme."""
+    # Normalizamos o título para evitar duplicatas por caixa alta/baixa.
+    # Chaves categóricas agrupam por códigos inteiros; observed=True evita
+    # materializar combinações Título x Nacionalidade que não existem.
+    df = df_raw.assign(
+        Titulo_Norm=df_raw['Titulo'].str.upper().str.strip().astype('category')
+    )
+    
+    return df.groupby(
+        ['Titulo_Norm', 'Nacionalidade'], observed=True, sort=False, as_index=False
+    ).agg({
+        'Titulo': 'first',
+        'Publico': 'sum',
+        'Renda': 'sum',
+        'Ano_Exibicao': 'min' # Ano de Lançamento (ou primeira aparição)
+    })
+
+def compute_year_agg(df_filtered):
+    """Público e Renda totais por ano de exibição."""
+    # Sem cache: fazer o hash do df_filtered a cada rerun custa mais que o groupby
+    return df_filtered.groupby('Ano_Exibicao')[['Publico', 'Renda']].sum().reset_index()
 
-    return pd.DataFrame(data)
+def sample_for_scatter(df_filtered, max_points=5000, n_outliers=500):
+    """Reduz o scatter a uma amostra representativa, preservando os extremos de Renda."""
+    # Sem cache, como o compute_year_agg: o hash do df_filtered custaria mais
+    # que a amostragem (e no caminho <= max_points não há o que economizar)
+    if len(df_filtered) <= max_points:
+        return df_filtered
+    
+    extremes = df_filtered.nlargest(n_outliers, 'Renda').index.union(
+        df_filtered.nsmallest(n_outliers, 'Renda').index
+    )
+    rest = df_filtered.drop(extremes).sample(max_points - len(extremes), random_state=0)
+    return df_filtered.loc[extremes.union(rest.index)]
+
+@st.cache_data(show_spinner=False)
+def to_csv_bytes(df):
+    """Serializa o DataFrame em CSV (UTF-8) para download."""
+    return df.to_csv(index=False).encode('utf-8')
+
+@st.cache_data(show_spinner=False)
+def to_parquet_bytes(df):
+    """Serializa o DataFrame em Parquet (zstd) para download."""
+    buf = BytesIO()
+    df.to_parquet(buf, engine='pyarrow', compression='zstd', index=False)
+    return buf.getvalue()
 
 # --- INTERFACE (FRONTEND) ---
 
@@ -125,119 +295,139 @@ with st.sidebar:
     
     st.info("Nota: O processamento usa Regex para limpar a formatação inconsistente dos PDFs originais.")
 
-# Lógica Principal
-if process_btn and uploaded_files:
-    with st.spinner("Lendo PDFs, limpando dados e estruturando tabelas..."):
-        df_raw = parse_ancine_pdf(uploaded_files)
+# --- ABAS DE ANÁLISE ---
+# Fragmento: mexer nos filtros reexecuta só as abas, e não o script inteiro.
+# As três abas ficam no mesmo fragmento porque os gráficos dependem dos
+# filtros da primeira.
+@st.fragment
+def render_analysis(df_raw, df_grouped):
+    """Filtros, rankings, gráficos e diagnóstico dos dados processados."""
+    tab1, tab2, tab3 = st.tabs(["📊 Tabelas & Rankings", "📈 Visualização Gráfica", "🔍 Diagnóstico"])
+    
+    with tab1:
+        st.subheader("Filtros de Pesquisa")
+        col1, col2 = st.columns(2)
         
-    if not df_raw.empty:
-        st.success(f"Sucesso! {len(df_raw)} registros de exibição processados.")
+        with col1:
+            years = st.slider(
+                "Selecione o Período", 
+                min_value=int(df_grouped['Ano_Exibicao'].min()),
+                max_value=int(df_grouped['Ano_Exibicao'].max()),
+                value=(2010, 2023)
+            )
+        with col2:
+            only_br = st.checkbox("Apenas Filmes Brasileiros", value=True)
         
-        # Agrupamento (Somar bilheterias de anos diferentes para o mesmo filme)
-        # Normalizamos o título para evitar duplicatas por caixa alta/baixa
-        df_raw['Titulo_Norm'] = df_raw['Titulo'].str.upper().str.strip()
+        # Aplicação dos Filtros numa única expressão (o pandas usa o numexpr
+        # quando está instalado, sem arrays booleanos intermediários)
+        year_min, year_max = years
+        expr = "@year_min <= Ano_Exibicao <= @year_max"
+        if only_br:
+            expr += " and Nacionalidade == 'Brasileira'"
+        mask = df_grouped.eval(expr)
         
-        df_grouped = df_raw.groupby(['Titulo_Norm', 'Nacionalidade']).agg({
-            'Titulo': 'first',
-            'Publico': 'sum',
-            'Renda': 'sum',
-            'Ano_Exibicao': 'min' # Ano de Lançamento (ou primeira aparição)
-        }).reset_index()
+        df_filtered = df_grouped[mask]
         
-        # --- ABAS DE ANÁLISE ---
-        tab1, tab2, tab3 = st.tabs(["📊 Tabelas & Rankings", "📈 Visualização Gráfica", "🔍 Diagnóstico"])
+        col_a, col_b = st.columns(2)
         
-        with tab1:
-            st.subheader("Filtros de Pesquisa")
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                years = st.slider(
-                    "Selecione o Período", 
-                    min_value=int(df_grouped['Ano_Exibicao'].min()),
-                    max_value=int(df_grouped['Ano_Exibicao'].max()),
-                    value=(2010, 2023)
-                )
-            with col2:
-                only_br = st.checkbox("Apenas Filmes Brasileiros", value=True)
-            
-            # Aplicação dos Filtros
-            mask = (df_grouped['Ano_Exibicao'] >= years[0]) & (df_grouped['Ano_Exibicao'] <= years[1])
-            if only_br:
-                mask = mask & (df_grouped['Nacionalidade'] == 'Brasileira')
-            
-            df_filtered = df_grouped[mask]
-            
-            col_a, col_b = st.columns(2)
-            
-            # Tabela 1: Top Bilheterias
-            with col_a:
-                st.markdown("### 🏆 Top 20 Maiores Públicos")
-                top_20 = df_filtered.sort_values('Publico', ascending=False).head(20)
-                st.dataframe(
-                    top_20[['Titulo', 'Ano_Exibicao', 'Publico', 'Renda']], 
-                    hide_index=True,
-                    use_container_width=True
-                )
-            
-            # Tabela 2: Cauda Longa (Menores Bilheterias Válidas)
-            with col_b:
-                st.markdown("### 📉 Cauda Longa (Menores Bilheterias)")
-                # Filtro de sanidade: Renda > 100 reais e Publico > 10 pessoas para evitar erros de leitura
-                mask_sanity = (df_filtered['Renda'] > 100) & (df_filtered['Publico'] > 10)
-                bottom_20 = df_filtered[mask_sanity].sort_values('Renda', ascending=True).head(20)
-                st.dataframe(
-                    bottom_20[['Titulo', 'Ano_Exibicao', 'Publico', 'Renda']], 
-                    hide_index=True,
-                    use_container_width=True
-                )
-            
-            # Download
-            csv = df_filtered.to_csv(index=False).encode('utf-8')
+        # Tabela 1: Top Bilheterias
+        with col_a:
+            st.markdown("### 🏆 Top 20 Maiores Públicos")
+            top_20 = df_filtered.nlargest(20, 'Publico')
+            st.dataframe(
+                top_20[['Titulo', 'Ano_Exibicao', 'Publico', 'Renda']], 
+                hide_index=True,
+                use_container_width=True
+            )
+        
+        # Tabela 2: Cauda Longa (Menores Bilheterias Válidas)
+        with col_b:
+            st.markdown("### 📉 Cauda Longa (Menores Bilheterias)")
+            # Filtro de sanidade: Renda > 100 reais e Publico > 10 pessoas para evitar erros de leitura
+            mask_sanity = (df_filtered['Renda'] > 100) & (df_filtered['Publico'] > 10)
+            bottom_20 = df_filtered[mask_sanity].nsmallest(20, 'Renda')
+            st.dataframe(
+                bottom_20[['Titulo', 'Ano_Exibicao', 'Publico', 'Renda']], 
+                hide_index=True,
+                use_container_width=True
+            )
+        
+        # Download (bytes em cache: só reserializa quando o filtro muda)
+        col_csv, col_parquet = st.columns(2)
+        with col_csv:
             st.download_button(
                 "📥 Baixar Dataset Completo (Filtrado)",
-                data=csv,
+                data=to_csv_bytes(df_filtered),
                 file_name="dados_ancine_filtrados.csv",
                 mime="text/csv"
             )
-
-        with tab2:
-            st.subheader("Evolução do Mercado")
-            
-            # Dados para gráficos (baseado no filtro anterior)
-            df_year = df_filtered.groupby('Ano_Exibicao')[['Publico', 'Renda']].sum().reset_index()
-            
-            # Gráfico 1: Linha do Tempo
-            fig_line = px.line(
-                df_year, 
-                x='Ano_Exibicao', 
-                y='Publico', 
-                title='Evolução do Público Total (Seleção Atual)',
-                markers=True
-            )
-            st.plotly_chart(fig_line, use_container_width=True)
-            
-            # Gráfico 2: Scatter (Renda vs Público)
-            fig_scatter = px.scatter(
-                df_filtered, 
-                x='Publico', 
-                y='Renda', 
-                hover_data=['Titulo'],
-                title='Distribuição Renda vs. Público (Identificador de Outliers)',
-                log_x=True, log_y=True # Escala logarítmica ajuda a ver a cauda longa
+        with col_parquet:
+            st.download_button(
+                "📦 Baixar em Parquet (Filtrado)",
+                data=to_parquet_bytes(df_filtered),
+                file_name="dados_ancine_filtrados.parquet",
+                mime="application/octet-stream"
             )
-            st.plotly_chart(fig_scatter, use_container_width=True)
 
-        with tab3:
-            st.subheader("Diagnóstico dos Dados Extraídos")
-            st.metric("Total de Linhas Processadas", len(df_raw))
-            st.metric("Total de Filmes Únicos", len(df_grouped))
-            
-            st.markdown("### Amostra dos Dados Brutos")
-            st.dataframe(df_raw.head(10))
-            
-    else:
-        st.warning("Nenhum dado válido encontrado. Verifique se o PDF é da 'Listagem de Filmes' da ANCINE.")
+    with tab2:
+        st.subheader("Evolução do Mercado")
+        
+        # Dados para gráficos (baseado no filtro anterior)
+        df_year = compute_year_agg(df_filtered)
+        
+        # Gráfico 1: Linha do Tempo
+        fig_line = px.line(
+            df_year, 
+            x='Ano_Exibicao', 
+            y='Publico', 
+            title='Evolução do Público Total (Seleção Atual)',
+            markers=True
+        )
+        st.plotly_chart(fig_line, use_container_width=True)
+        
+        # Gráfico 2: Scatter (Renda vs Público)
+        # Amostra + outliers: o navegador não precisa receber todos os pontos
+        fig_scatter = px.scatter(
+            sample_for_scatter(df_filtered), 
+            x='Publico', 
+            y='Renda', 
+            hover_data=['Titulo'],
+            title='Distribuição Renda vs. Público (Identificador de Outliers)',
+            log_x=True, log_y=True, # Escala logarítmica ajuda a ver a cauda longa
+            render_mode='webgl'
+        )
+        st.plotly_chart(fig_scatter, use_container_width=True)
+
+    with tab3:
+        st.subheader("Diagnóstico dos Dados Extraídos")
+        st.metric("Total de Linhas Processadas", len(df_raw))
+        st.metric("Total de Filmes Únicos", len(df_grouped))
+        
+        st.markdown("### Amostra dos Dados Brutos")
+        st.dataframe(df_raw.head(10))
+
+# Lógica Principal
+# Os resultados ficam no session_state: as reexecuções disparadas pelos
+# widgets (em que o botão volta a False) continuam exibindo a análise.
+if process_btn and uploaded_files:
+    with st.spinner("Lendo PDFs, limpando dados e estruturando tabelas..."):
+        df_raw = parse_ancine_pdf(uploaded_files)
+        # Agrupamento em cache: interações com os filtros não refazem o groupby
+        st.session_state.df_raw = df_raw
+        st.session_state.df_grouped = build_grouped(df_raw) if not df_raw.empty else None
 
 elif process_btn and not uploaded_files:
-    st.warning("Por favor, faça upload de pelo menos um arquivo PDF.")
\ No newline at end of file
+    # Descarta a análise anterior para a página não contradizer o aviso
+    st.session_state.pop('df_raw', None)
+    st.session_state.pop('df_grouped', None)
+    st.warning("Por favor, faça upload de pelo menos um arquivo PDF.")
+
+if 'df_raw' in st.session_state:
+    df_raw = st.session_state.df_raw
+    
+    if not df_raw.empty:
+        st.success(f"Sucesso! {len(df_raw)} registros de exibição processados.")
+        render_analysis(df_raw, st.session_state.df_grouped)
+        
+    else:
+        st.warning("Nenhum dado válido encontrado. Verifique se o PDF é da 'Listagem de Filmes' da ANCINE.")
\ No newline at end of file